@@ -1,7 +1,16 @@
-from openai import AzureOpenAI
-import os
-from dotenv import load_dotenv
-from config.config import LLM_MODEL
+import hashlib
+import json
+from config.config import (
+    LLM_MODEL,
+    LLM_CACHE_ENABLED,
+    SEMANTIC_CACHE_ENABLED,
+)
+from app.utils.llm_cache import LLMCache, SemanticCache
+from app.utils.openai_client import get_client
+
+# Shared response caches; identical requests are answered without an API call
+_llm_cache = LLMCache() if LLM_CACHE_ENABLED else None
+_semantic_cache = SemanticCache() if SEMANTIC_CACHE_ENABLED else None
 
 
 class BaseAgent:
@@ -17,19 +26,19 @@ class BaseAgent:
         """
         self.model_name = model_name
         self.temperature = temperature
-        self.client = self._init_client()
+        self._client = None
+
+    @property
+    def client(self):
+        """The Azure OpenAI client, created on first use."""
+        # Agents like the summarization agent never call the API, so they skip this
+        if self._client is None:
+            self._client = self._init_client()
+        return self._client
 
     def _init_client(self):
         """Initialize the Azure OpenAI client."""
-        # Load environment variables
-        load_dotenv()
-
-        # Initialize Azure OpenAI client
-        return AzureOpenAI(
-            api_version="2024-02-15-preview",
-            azure_endpoint="https://swisshacks-aoai-westeurope.openai.azure.com/",
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-        )
+        return get_client()
 
     def run(self, *args, **kwargs):
         """
@@ -40,25 +49,119 @@ class BaseAgent:
         """
         raise NotImplementedError("Subclasses must implement the 'run' method.")
 
-    def get_completion(self, messages, temperature=None, response_format=None):
+    def get_completion(
+        self,
+        messages,
+        temperature=None,
+        response_format=None,
+        on_token=None,
+        model=None,
+        semantic_cache=False,
+    ):
         """
         Get a completion from the Azure OpenAI API.
 
         Args:
             messages (list): List of message dictionaries with 'role' and 'content'.
             temperature (float, optional): Override the default temperature.
+            response_format (dict, optional): Response format passed to the API.
+            on_token (callable, optional): If given, the completion is streamed and
+                each text delta is passed to this callback as it arrives.
+            model (str, optional): Override the agent's model for this call.
+            semantic_cache (bool): Also answer near-duplicate prompts from the
+                semantic cache. Only meant for free-text summarisation, where a
+                close paraphrase of an earlier answer is acceptable.
 
         Returns:
             str: The content of the completion.
         """
         if temperature is None:
             temperature = self.temperature
+        if model is None:
+            model = self.model_name
+
+        cache_key = None
+        if _llm_cache is not None:
+            cache_key = LLMCache.make_key(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                response_format=response_format,
+            )
+            cached = _llm_cache.get(cache_key)
+            if cached is not None:
+                if on_token is not None:
+                    on_token(cached)
+                return cached
 
-        completion = self.client.chat.completions.create(
-            model=self.model_name,
+        # Near-duplicate prompts are matched on the user message only; the system
+        # prompt and request settings are constant per call site, so they just
+        # select the namespace
+        prompt_vector = None
+        if semantic_cache and _semantic_cache is not None:
+            system_prompt = "\n".join(
+                message["content"] for message in messages if message["role"] == "system"
+            )
+            namespace = "/".join(
+                [
+                    type(self).__name__,
+                    model,
+                    str(temperature),
+                    json.dumps(response_format, sort_keys=True),
+                    hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16],
+                ]
+            )
+            prompt_vector = _semantic_cache.embed(
+                "\n".join(
+                    message["content"] for message in messages if message["role"] == "user"
+                )
+            )
+            cached = _semantic_cache.get(namespace, prompt_vector)
+            if cached is not None:
+                if on_token is not None:
+                    on_token(cached)
+                return cached
+
+        if on_token is None:
+            completion = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                response_format=response_format,
+            )
+            content = completion.choices[0].message.content
+        else:
+            content = self._stream_completion(
+                messages, model, temperature, response_format, on_token
+            )
+        if content is not None:
+            if cache_key is not None:
+                _llm_cache.set(cache_key, content)
+            if prompt_vector is not None:
+                _semantic_cache.set(namespace, prompt_vector, content)
+
+        return content
+
+    def _stream_completion(
+        self, messages, model, temperature, response_format, on_token
+    ):
+        """Stream a completion, forwarding each text delta to `on_token`."""
+        stream = self.client.chat.completions.create(
+            model=model,
             messages=messages,
             temperature=temperature,
             response_format=response_format,
+            stream=True,
         )
 
-        return completion.choices[0].message.content
+        parts = []
+        for chunk in stream:
+            # Azure sends content-filter chunks without choices
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                on_token(delta)
+
+        return "".join(parts)
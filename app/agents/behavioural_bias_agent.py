@@ -7,6 +7,19 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 from app.agents.base_agent import BaseAgent
 from app.utils.data_loader import DataLoader
 
+BIAS_PROMPT_TEMPLATE = """Identify 3 specific behavioral biases the client shows in the conversation, using the definitions below (max 150 characters each).
+
+Return a JSON object {{"biases": [...]}}, each entry formatted as:
+"- [Client Name] showed [bias name] when [specific behavior/statement]."
+
+Bias Definitions:
+{biases}
+
+Conversation:
+{transcript}"""
+
+BIAS_SYSTEM_PROMPT = "You are a behavioral finance expert designed to output JSON, analyzing client-advisor conversations for cognitive and emotional biases."
+
 
 class BehaviouralBiasAgent(BaseAgent):
     """Agent responsible for identifying behavioral biases in client-advisor conversations."""
@@ -22,52 +35,29 @@ class BehaviouralBiasAgent(BaseAgent):
             list: Identified behavioral biases.
         """
         transcript = DataLoader.load_transcript()
-        biases = DataLoader.load_biases()
-
-        biases_str = ""
-        for bias in biases:
-            biases_str += f"Category: {bias['category']}\n"
-            biases_str += f"Bias: {bias['bias']}\n"
-            biases_str += f"Description: {bias['description']}\n"
-            biases_str += f"Example: {bias['examples']}\n\n"
-
-        prompt_template = """
-        Analyze the following conversation between a financial advisor and a client.
-        Identify any behavioral biases exhibited by the client based on the provided bias definitions.
-        
-        Conversation:
-        {transcript}
-        
-        Behavioral Biases to Look For:
-        {biases}
-        
-        Provide 3 specific instances where the client exhibited behavioral biases (max 150 characters per bias).
-        Format each finding as:
-        - [Client Name] showed [bias name] when [specific behavior/statement].
-        
-        Example format:
-        - Haris showed confirmation bias when he dismissed market data that contradicted his tech stock investment.
-        - Haris showed loss aversion when he refused to sell underperforming stocks.
-        
-        Keep each finding clear, specific and concise.
-        """
+        biases_str = DataLoader.load_biases_text()
 
-        formatted_prompt = prompt_template.format(
+        formatted_prompt = BIAS_PROMPT_TEMPLATE.format(
             transcript=transcript, biases=biases_str
         )
 
         messages = [
             {
                 "role": "system",
-                "content": "You are a behavioral finance expert analyzing client-advisor conversations for cognitive and emotional biases.",
+                "content": BIAS_SYSTEM_PROMPT,
             },
             {"role": "user", "content": formatted_prompt},
         ]
 
-        bias_analysis = self.get_completion(messages, temperature=0.2)
-        bias_list = [bias.strip() for bias in bias_analysis.split("\n") if bias.strip()]
+        bias_analysis = self.get_completion(
+            messages, temperature=0.2, response_format={"type": "json_object"}
+        )
 
-        return bias_list
+        try:
+            return json.loads(bias_analysis).get("biases", [])
+        except (json.JSONDecodeError, AttributeError):
+            print("Error: Could not parse behavioral biases as JSON")
+            return []
 
     def run(self):
         """
@@ -8,6 +8,16 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 from app.agents.base_agent import BaseAgent
 from app.utils.data_loader import DataLoader
 
+CLIENT_INFO_PROMPT_TEMPLATE = """Extract client facts explicitly stated in the conversation. No inferences.
+
+Return a JSON object with any of these fields; omit fields that are not mentioned:
+"Location", "Marital Status", "# of Children", "Occupation", "Educational Level", "Address"
+
+Conversation:
+{transcript}"""
+
+CLIENT_INFO_SYSTEM_PROMPT = "You are a data validation expert designed to output JSON. Extract only explicitly stated facts. Do not make assumptions. Ignore unchanged information."
+
 
 class DataQualityAgent(BaseAgent):
     """Agent responsible for validating and cross-referencing conversation data with client state."""
@@ -21,35 +31,15 @@ class DataQualityAgent(BaseAgent):
         Returns a dictionary of confirmed client information.
         """
         transcript = DataLoader.load_transcript()
-        prompt_template = """
-        Extract ONLY factual information about the client from this conversation.
-        ONLY include information that is explicitly stated in the conversation.
-        DO NOT make assumptions or inferences.
-        
-        Conversation:
-        {transcript}
-        
-        Return a JSON object with these fields (only include fields that are explicitly mentioned):
-        {{
-            "Location": "explicitly stated location",
-            "Marital Status": "explicitly stated marital status",
-            "# of Children": "explicitly stated number of children",
-            "Occupation": "explicitly stated occupation",
-            "Educational Level": "explicitly stated educational level",
-            "Address": "explicitly stated address",
-        }}
-        
-        If a field is not explicitly mentioned, omit it from the JSON.
-        """
 
         messages = [
             {
                 "role": "system",
-                "content": "You are a data validation expert designed to output JSON. Extract only explicitly stated facts. Do not make assumptions. Ignore unchanged information.",
+                "content": CLIENT_INFO_SYSTEM_PROMPT,
             },
             {
                 "role": "user",
-                "content": prompt_template.format(transcript=transcript),
+                "content": CLIENT_INFO_PROMPT_TEMPLATE.format(transcript=transcript),
             },
         ]
 
@@ -1,6 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.documents import Document
+
 from app.agents.base_agent import BaseAgent
 from app.utils.vector_store import VectorStore
 from app.utils.data_loader import DataLoader
+from config.config import MIN_SUMMARY_CHARS
+
+# Shared by client and product retrieval; built once at import time
+SUMMARY_PROMPT_TEMPLATE = """Provide a concise summary of the {data_type} information below that is relevant to the query.
+
+Query: {query}
+
+{data_label} Information:
+{results}"""
+
+SYSTEM_PROMPTS = {
+    data_type: f"You are a financial data analyst specializing in {data_type} information."
+    for data_type in ("client", "product")
+}
 
 
 class DataRetrievalAgent(BaseAgent):
@@ -13,29 +31,67 @@ class DataRetrievalAgent(BaseAgent):
         self.product_data = None
         self.client_vector_store = None
         self.product_vector_store = None
+        self._client_vs_wrapper = None
+        self._product_vs_wrapper = None
+        self._results = {}
 
     def load_data(self):
         """Load and index client and product data."""
-        print("Loading client state data...")
-        self.client_data_text = DataLoader.load_client_state_txt()
+        # The two collections are independent, so they are loaded and embedded concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            client_future = executor.submit(self._load_client_data)
+            product_future = executor.submit(self._load_product_data)
+        client_future.result()
+        product_future.result()
 
-        print("Loading product portfolio data...")
-        self.product_data = DataLoader.load_product_portfolio()
+        # Results memoized against the previous indexes may no longer match them
+        self._results.clear()
 
-        print("Creating vector stores for semantic search...")
-        vector_store = VectorStore()
+        print("Data loading and indexing complete.")
 
-        if self.client_data_text:
-            self.client_vector_store = vector_store.create_or_load(
-                self.client_data_text, "client_state"
+    def _load_client_data(self):
+        """Load the client state and index it for semantic search."""
+        print("Loading client state data...")
+        self.client_data = DataLoader.load_client_state_dict()
+
+        # One document per field, so a search returns only the relevant fields; the
+        # category and notes keep the context the field name alone lacks
+        if self.client_data:
+            client_documents = [
+                Document(
+                    page_content=(
+                        f"{record['Category']} - {record['Field']}: {record['Value']}"
+                        + (f" ({record['Notes']})" if record["Notes"] else "")
+                    ),
+                    metadata={"category": record["Category"], "field": record["Field"]},
+                )
+                for record in DataLoader.load_client_state_records()
+            ]
+            self._client_vs_wrapper, self.client_vector_store = self._index(
+                client_documents, "client_state"
             )
 
+    def _load_product_data(self):
+        """Load the product portfolio and index it for semantic search."""
+        print("Loading product portfolio data...")
+        self.product_data = DataLoader.load_product_portfolio()
+
         if self.product_data:
-            self.product_vector_store = vector_store.create_or_load(
-                self.product_data, "product_portfolio"
+            self._product_vs_wrapper, self.product_vector_store = self._index(
+                self.product_data, "product_portfolio", quantize=True
             )
 
-        print("Data loading and indexing complete.")
+    @staticmethod
+    def _index(data, collection_name, **kwargs):
+        """
+        Create or load the vector store for a collection.
+
+        Returns:
+            tuple: The VectorStore wrapper and the store it created or loaded.
+        """
+        # Keep the wrapper so searches reuse its embeddings client
+        wrapper = VectorStore()
+        return wrapper, wrapper.create_or_load(data, collection_name, **kwargs)
 
     def retrieve_client_info(self, query, k=3):
         """
@@ -55,40 +111,11 @@ class DataRetrievalAgent(BaseAgent):
         # Perform semantic search
         results = []
         if self.client_vector_store:
-            vector_store = VectorStore()
-            vector_store.vector_store = self.client_vector_store
-            results = vector_store.search(query, k=k)
+            results = self._client_vs_wrapper.search(query, k=k)
 
         # Process results using LLM to format a response
         if results:
-            prompt_template = """
-            Based on the following client information, provide a concise summary relevant to: {query}
-            
-            Client Information:
-            {results}
-            
-            Summary:
-            """
-
-            # Format results into a single string
-            results_text = "\n".join([doc.page_content for doc in results])
-
-            # Format the prompt with the query and results
-            formatted_prompt = prompt_template.format(query=query, results=results_text)
-
-            # Create messages for the API call
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are a financial data analyst specializing in client information.",
-                },
-                {"role": "user", "content": formatted_prompt},
-            ]
-
-            # Get summary from Azure OpenAI
-            response = self.get_completion(messages)
-
-            return {"summary": response, "raw_results": results}
+            return self._summarize_results(query, results, "client")
 
         return {"summary": "No relevant client information found.", "raw_results": []}
 
@@ -110,63 +137,85 @@ class DataRetrievalAgent(BaseAgent):
         # Perform semantic search
         results = []
         if self.product_vector_store:
-            vector_store = VectorStore()
-            vector_store.vector_store = self.product_vector_store
-            results = vector_store.search(query, k=k)
+            results = self._product_vs_wrapper.search(query, k=k)
 
         # Process results using LLM to format a response
         if results:
-            prompt_template = """
-            Based on the following product information, provide a concise summary relevant to: {query}
-            
-            Product Information:
-            {results}
-            
-            Summary:
-            """
-
-            # Format results into a single string
-            results_text = "\n".join([doc.page_content for doc in results])
-
-            # Format the prompt with the query and results
-            formatted_prompt = prompt_template.format(query=query, results=results_text)
-
-            # Create messages for the API call
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are a financial data analyst specializing in product information.",
-                },
-                {"role": "user", "content": formatted_prompt},
-            ]
+            return self._summarize_results(query, results, "product")
 
-            # Get summary from Azure OpenAI
-            response = self.get_completion(messages)
+        return {"summary": "No relevant product information found.", "raw_results": []}
 
-            return {"summary": response, "raw_results": results}
+    def _summarize_results(self, query, results, data_type):
+        """
+        Summarize search results with respect to a query.
 
-        return {"summary": "No relevant product information found.", "raw_results": []}
+        Args:
+            query (str): The query the results were retrieved for.
+            results (list): Retrieved documents.
+            data_type (str): Kind of data searched ('client' or 'product').
 
-    def run(self, query_type, query):
+        Returns:
+            dict: Dictionary with the summary and raw results.
+        """
+        # Format results into a single string
+        results_text = "\n".join(doc.page_content for doc in results)
+
+        # Short results are already concise; summarizing them only adds a round-trip
+        if len(results_text) < MIN_SUMMARY_CHARS:
+            return {"summary": results_text, "raw_results": results}
+
+        # Format the prompt with the query and results
+        formatted_prompt = SUMMARY_PROMPT_TEMPLATE.format(
+            data_type=data_type,
+            data_label=data_type.capitalize(),
+            query=query,
+            results=results_text,
+        )
+
+        # Create messages for the API call
+        messages = [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPTS[data_type],
+            },
+            {"role": "user", "content": formatted_prompt},
+        ]
+
+        # Get summary from Azure OpenAI
+        response = self.get_completion(messages, semantic_cache=True)
+
+        return {"summary": response, "raw_results": results}
+
+    def run(self, query_type, query, k=3):
         """
         Run the data retrieval agent to fetch information.
 
         Args:
             query_type (str): Type of data to retrieve ('client' or 'product').
             query (str): The query to search for.
+            k (int): Number of results to retrieve. Client data is indexed one
+                field per document, so broad client queries need a larger k.
 
         Returns:
             dict: The retrieved information.
         """
-        if not self.client_data or not self.product_data:
+        if not self.client_vector_store or not self.product_vector_store:
             self.load_data()
 
+        # The agent is shared, so a repeated query reuses the earlier retrieval and summary
+        key = (query_type.lower(), query, k)
+        if key in self._results:
+            return self._results[key]
+
         if query_type.lower() == "client":
-            return self.retrieve_client_info(query)
+            result = self.retrieve_client_info(query, k=k)
         elif query_type.lower() == "product":
-            return self.retrieve_product_info(query)
+            result = self.retrieve_product_info(query, k=k)
         else:
             return {
                 "summary": f"Invalid query type: {query_type}. Use 'client' or 'product'.",
                 "raw_results": [],
             }
+
+        self._results[key] = result
+        return result
@@ -8,88 +8,109 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 from app.agents.base_agent import BaseAgent
 from app.utils.data_loader import DataLoader
 from app.agents.data_retrieval_agent import DataRetrievalAgent
+from config.config import CLIENT_PROFILE_RESULTS
+
+RECOMMENDATIONS_PROMPT_TEMPLATE = """Give the advisor 3 specific recommendations (max 150 characters each) on life events, portfolio adjustments and actions.
+
+One per line, formatted as:
+- During the meeting, [Client Name] mentioned [life event/concern]. The Advisor should [action].
+
+Client Information:
+{client_data}"""
+
+RECOMMENDATIONS_SYSTEM_PROMPT = "You are a financial advisor providing specific recommendations based on client conversations."
 
 
 class FinancialAdvisorAgent(BaseAgent):
     """Agent responsible for providing financial advisor recommendations based on the conversation."""
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, data_retrieval_agent=None, **kwargs):
+        """
+        Initialize the financial advisor agent.
+
+        Args:
+            data_retrieval_agent (DataRetrievalAgent): Shared retrieval agent, owned
+                by the orchestrator so its vector stores are loaded only once.
+        """
+        if data_retrieval_agent is None:
+            raise ValueError("FinancialAdvisorAgent requires a data_retrieval_agent.")
         super().__init__(*args, **kwargs)
+        self.data_retrieval_agent = data_retrieval_agent
 
-    def generate_recommendations(self, client_data):
+    def generate_recommendations(self, client_data, on_token=None):
         """
         Generate financial advisor recommendations based on the conversation.
 
         Args:
             client_data (dict): Client information from data retrieval.
+            on_token (callable, optional): Receives the recommendations as they stream in.
 
         Returns:
             list: Financial advisor recommendations.
         """
+        if not client_data:
+            print("Warning: No client data available. Skipping recommendations.")
+            return []
+
         client_data_str = (
-            "\n".join([f"{k}: {v}" for k, v in client_data.items()])
+            "\n".join(f"{k}: {v}" for k, v in sorted(client_data.items()))
             if isinstance(client_data, dict)
             else client_data
         )
 
-        prompt_template = """
-        Based on the following conversation between a financial advisor and a client, provide 3 specific and short (max 150 characters) recommendations for the advisor. Focus on life events, portfolio adjustments, and necessary actions.
-        
-        Client Information:
-        {client_data}
-        
-        Provide recommendations in the following format:
-        - [Client Name] mentioned [life event/concern]. Advisor should [action].
-        
-        Example format:
-        - During the meeting, Haris mentioned a significant life event (buying a house). The Advisor should consider updating the portfolio allocation to generate liquidity to purchase a house.
-        - During the meeting, Haris mentioned a significant life event (having a baby). The Advisor should consider updating the portfolio allocation.
-        
-        Keep each recommendation clear, specific, and actionable. Focus on concrete steps the advisor should take.
-        """
-
         # Format the prompt with the client data, topics, and emotional insights
-        formatted_prompt = prompt_template.format(
+        formatted_prompt = RECOMMENDATIONS_PROMPT_TEMPLATE.format(
             client_data=client_data_str,
         )
 
         messages = [
             {
                 "role": "system",
-                "content": "You are a financial advisor providing specific recommendations based on client conversations.",
+                "content": RECOMMENDATIONS_SYSTEM_PROMPT,
             },
             {"role": "user", "content": formatted_prompt},
         ]
 
-        recommendations = self.get_completion(messages, temperature=0.2)
+        recommendations = self.get_completion(
+            messages, temperature=0.2, on_token=on_token
+        )
         recommendation_list = [
-            rec.strip() for rec in recommendations.split("\n") if rec.strip()
+            rec for rec in (line.strip() for line in recommendations.splitlines()) if rec
         ]
 
         return recommendation_list
 
-    def run(self):
+    def run(self, on_token=None):
         """
         Run the financial advisor agent to generate recommendations.
 
+        Args:
+            on_token (callable, optional): Receives the recommendations as they stream in.
+
         Returns:
             list: The financial advisor recommendations.
         """
-        data_retrieval_agent = DataRetrievalAgent()
-        client_data = data_retrieval_agent.run(
-            "client", "client profile and financial situation"
+        # The whole profile is relevant, and each retrieved document is a single field
+        client_data = self.data_retrieval_agent.run(
+            "client", "client profile and financial situation", k=CLIENT_PROFILE_RESULTS
         )
 
         print("Generating financial advisor recommendations...")
         recommendations = self.generate_recommendations(
             client_data["summary"] if isinstance(client_data, dict) else client_data,
+            on_token=on_token,
         )
 
         return recommendations
 
 
 if __name__ == "__main__":
-    recommendation_agent = FinancialAdvisorAgent()
-    recommendations = recommendation_agent.run()
+    recommendation_agent = FinancialAdvisorAgent(
+        data_retrieval_agent=DataRetrievalAgent()
+    )
+    recommendations = recommendation_agent.run(
+        on_token=lambda token: print(token, end="", flush=True)
+    )
+    print()
     with open("output/financial_advisor_agent.json", "w") as f:
         json.dump(recommendations, f)
@@ -1,11 +1,110 @@
 import os
 import sys
+import io
 import json
+import functools
+import time
+import tiktoken
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from app.agents.base_agent import BaseAgent
 from app.utils.data_loader import DataLoader
+from app.utils.openai_client import get_client
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from config.config import (
+    MAX_CONCURRENT_REQUESTS,
+    MAX_TRANSCRIPT_TOKENS,
+    TOKENIZER_ENCODING,
+    TRANSCRIPT_CHUNK_SIZE,
+    TRANSCRIPT_CHUNK_OVERLAP,
+    CHUNK_DEDUP_THRESHOLD,
+    TRANSCRIPT_BATCH_ENABLED,
+    BATCH_API_VERSION,
+    BATCH_LLM_MODEL,
+    BATCH_POLL_INTERVAL,
+    BATCH_MAX_WAIT,
+)
+
+CHUNK_PROMPT_TEMPLATE = """Summarize this advisor-client conversation excerpt. Keep every fact, figure, life event, product question and decision.
+
+Excerpt:
+{chunk}"""
+
+MEETING_NOTES_PROMPT_TEMPLATE = """Summarize the advisor-client conversation below, focusing on concrete information and decisions.
+
+Return a JSON object:
+{{"meeting_notes": ["key point", ...], "action_items": ["agreed action item", ...]}}
+Keep each point short, as plain text without bullet markers.
+
+Transcript:
+{transcript}"""
+
+CHUNK_SYSTEM_PROMPT = "You are a financial conversation analyst specializing in concise summaries."
+
+MEETING_NOTES_SYSTEM_PROMPT = "You are a financial conversation analyst designed to output JSON, specializing in concise summaries."
+
+# The chunk prompt is rendered once per chunk, so it is split around its only
+# placeholder and filled by concatenation, and the system message is shared
+_CHUNK_PROMPT_PREFIX, _CHUNK_PROMPT_SUFFIX = CHUNK_PROMPT_TEMPLATE.split("{chunk}")
+_CHUNK_SYSTEM_MESSAGE = {"role": "system", "content": CHUNK_SYSTEM_PROMPT}
+
+def _shingles(text, size=5):
+    """Return the set of word n-grams of a text."""
+    words = text.lower().split()
+    return {tuple(words[i : i + size]) for i in range(max(len(words) - size + 1, 1))}
+
+
+def _drop_near_duplicates(chunks):
+    """
+    Drop chunks that are near-identical to an earlier chunk.
+
+    Args:
+        chunks (list): Transcript chunks, in order.
+
+    Returns:
+        list: The distinct chunks, in order.
+    """
+    distinct = []
+    seen = []
+    for chunk in chunks:
+        shingles = _shingles(chunk)
+        if any(
+            len(shingles & other) / len(shingles | other) > CHUNK_DEDUP_THRESHOLD
+            for other in seen
+        ):
+            continue
+        distinct.append(chunk)
+        seen.append(shingles)
+    return distinct
+
+
+def _count_tokens(text):
+    """Count the tokens of a text with the model's tokenizer."""
+    return len(tiktoken.get_encoding(TOKENIZER_ENCODING).encode(text))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_splitter():
+    """
+    Return the transcript splitter, built on first use.
+
+    The splitter is stateless, so all agents share one. Chunk sizes are measured
+    with the model's tokenizer, so they match the request's token budget; loading
+    it is deferred so importing this module stays cheap.
+    """
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        encoding_name=TOKENIZER_ENCODING,
+        chunk_size=TRANSCRIPT_CHUNK_SIZE,
+        chunk_overlap=TRANSCRIPT_CHUNK_OVERLAP,
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _split_transcript(transcript):
+    """Split a transcript into distinct chunks, memoized per transcript."""
+    return tuple(_drop_near_duplicates(_get_splitter().split_text(transcript)))
 
 
 class MeetingNotesAgent(BaseAgent):
@@ -14,6 +113,191 @@ class MeetingNotesAgent(BaseAgent):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def split_transcript(self, transcript):
+        """
+        Split the transcript into chunks. The split is computed once per transcript
+        and shared by all agents.
+
+        Repeated passages (disclaimers, re-read figures) would be summarized twice,
+        so near-duplicate chunks are dropped.
+
+        Args:
+            transcript (str): The full transcript.
+
+        Returns:
+            tuple: Transcript chunks.
+        """
+        return _split_transcript(transcript)
+
+    def summarize_chunk(self, chunk):
+        """
+        Summarize one chunk of the transcript.
+
+        Args:
+            chunk (str): A transcript chunk.
+
+        Returns:
+            str: Summary of the chunk.
+        """
+        messages = [
+            _CHUNK_SYSTEM_MESSAGE,
+            {
+                "role": "user",
+                "content": _CHUNK_PROMPT_PREFIX + chunk + _CHUNK_PROMPT_SUFFIX,
+            },
+        ]
+
+        return self.get_completion(messages, semantic_cache=True)
+
+    def _merge_summaries(self, summaries):
+        """Summarize a group of adjacent summaries into one."""
+        if len(summaries) == 1:
+            return summaries[0]
+        return self.summarize_chunk("\n\n".join(summaries))
+
+    def reduce_summaries(self, summaries):
+        """
+        Merge chunk summaries pairwise until together they fit the notes prompt.
+
+        Each level halves the number of summaries, so every request stays about
+        two summaries long however long the transcript is.
+
+        Args:
+            summaries (list): Chunk summaries, in transcript order.
+
+        Returns:
+            str: The condensed transcript.
+        """
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            while (
+                len(summaries) > 1
+                and _count_tokens("\n\n".join(summaries)) > MAX_TRANSCRIPT_TOKENS
+            ):
+                pairs = [summaries[i : i + 2] for i in range(0, len(summaries), 2)]
+                summaries = list(executor.map(self._merge_summaries, pairs))
+        return "\n\n".join(summaries)
+
+    def summarize_transcript_chunks(self, transcript):
+        """
+        Condense a long transcript by summarizing each chunk (map step).
+
+        Args:
+            transcript (str): The full transcript.
+
+        Returns:
+            str: The condensed transcript.
+        """
+        # Chunk summaries are independent, so the requests run concurrently
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            chunk_summaries = list(
+                executor.map(self.summarize_chunk, self.split_transcript(transcript))
+            )
+        return self.reduce_summaries(chunk_summaries)
+
+    def summarize_transcript_chunks_batch(self, transcript):
+        """
+        Condense a long transcript by summarizing each chunk in one Batch API job.
+
+        Batch jobs are cheaper and not subject to the per-request rate limits, but
+        may take minutes to complete, so this is meant for offline runs. If the job
+        fails or does not finish within BATCH_MAX_WAIT, the chunks are summarized
+        with regular requests instead.
+
+        Args:
+            transcript (str): The full transcript.
+
+        Returns:
+            str: The condensed transcript.
+        """
+        chunks = self.split_transcript(transcript)
+        try:
+            summaries = self._run_summary_batch(chunks)
+        except Exception as e:
+            print(f"Error: Batch summarization failed ({e}), using regular requests")
+            return self.summarize_transcript_chunks(transcript)
+
+        # Chunks whose batch request failed are summarized with a regular request
+        ordered = [
+            summaries.get(f"chunk-{i}") or self.summarize_chunk(chunk)
+            for i, chunk in enumerate(chunks)
+        ]
+        return self.reduce_summaries(ordered)
+
+    def _run_summary_batch(self, chunks):
+        """
+        Submit the chunk summary requests as one batch job and wait for the results.
+
+        Args:
+            chunks (tuple): Transcript chunks.
+
+        Returns:
+            dict: Chunk summaries keyed by custom_id ("chunk-<index>").
+
+        Raises:
+            TimeoutError: If the job does not finish within BATCH_MAX_WAIT.
+            RuntimeError: If the job ends without completing.
+        """
+        # Batch endpoints need a newer API version and a Global-Batch deployment
+        client = get_client(api_version=BATCH_API_VERSION)
+        requests = [
+            {
+                "custom_id": f"chunk-{i}",
+                "method": "POST",
+                "url": "/chat/completions",
+                "body": {
+                    "model": BATCH_LLM_MODEL,
+                    "temperature": self.temperature,
+                    "messages": [
+                        _CHUNK_SYSTEM_MESSAGE,
+                        {
+                            "role": "user",
+                            "content": _CHUNK_PROMPT_PREFIX
+                            + chunk
+                            + _CHUNK_PROMPT_SUFFIX,
+                        },
+                    ],
+                },
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+        batch_input = "\n".join(json.dumps(request) for request in requests)
+
+        input_file = client.files.create(
+            file=("chunks.jsonl", io.BytesIO(batch_input.encode("utf-8"))),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/chat/completions",
+            completion_window="24h",
+        )
+
+        print(f"Waiting for batch job {batch.id} to complete...")
+        deadline = time.monotonic() + BATCH_MAX_WAIT
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.monotonic() > deadline:
+                client.batches.cancel(batch.id)
+                raise TimeoutError(f"batch job {batch.id} still {batch.status}")
+            time.sleep(BATCH_POLL_INTERVAL)
+            batch = client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"batch job {batch.id} ended with status {batch.status}")
+
+        # Results are not returned in input order, so they are keyed by custom_id
+        summaries = {}
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                print(f"Error: Batch request {result['custom_id']} failed")
+                continue
+            message = response["body"]["choices"][0]["message"]
+            summaries[result["custom_id"]] = message["content"]
+
+        return summaries
+
     def create_meeting_notes(self):
         """
         Create a structured summary with two sections: meeting notes and action items.
@@ -26,56 +310,46 @@ class MeetingNotesAgent(BaseAgent):
         """
         transcript = DataLoader.load_transcript()
 
-        prompt_template = """
-        Create a concise summary of the following conversation between a financial advisor and a client.
-        The summary should be organized into exactly two sections as outlined below.
-        
-        Transcript:
-        {transcript}
-        
-        Please provide the summary in the following format:
-        
-        Client/Advisor Meeting Notes
-        - [Key point 1]
-        - [Key point 2]
-        - [Key point 3]
-        
-        Agreed upon action items
-        - [Action item 1]
-        - [Action item 2]
-        
-        Keep each point short and clear. Use simple bullet points without any additional formatting.
-        Focus on concrete information and decisions made during the conversation.
-        """
+        # Long transcripts are condensed first; the notes prompt is the reduce step
+        if _count_tokens(transcript) > MAX_TRANSCRIPT_TOKENS:
+            print("Condensing long transcript before creating meeting notes...")
+            chunks = self.split_transcript(transcript)
+            if len(chunks) == 1:
+                # Repeated passages collapsed into one chunk, which fits the notes prompt as is
+                transcript = chunks[0]
+            elif TRANSCRIPT_BATCH_ENABLED:
+                transcript = self.summarize_transcript_chunks_batch(transcript)
+            else:
+                transcript = self.summarize_transcript_chunks(transcript)
 
         # Format the prompt with the transcript
-        formatted_prompt = prompt_template.format(transcript=transcript)
+        formatted_prompt = MEETING_NOTES_PROMPT_TEMPLATE.format(transcript=transcript)
 
         # Create messages for the API call
         messages = [
             {
                 "role": "system",
-                "content": "You are a financial conversation analyst specializing in concise summaries.",
+                "content": MEETING_NOTES_SYSTEM_PROMPT,
             },
             {"role": "user", "content": formatted_prompt},
         ]
 
         # Get structured summary from Azure OpenAI
-        structured_output = self.get_completion(messages)
+        structured_output = self.get_completion(
+            messages, response_format={"type": "json_object"}
+        )
 
-        # Process the output to extract sections
-        sections = {}
+        try:
+            parsed = json.loads(structured_output)
+        except json.JSONDecodeError:
+            print("Error: Could not parse meeting notes as JSON")
+            return {}
 
-        # Parse the sections
-        if "Client/Advisor Meeting Notes" in structured_output:
-            parts = structured_output.split("Client/Advisor Meeting Notes")[1].split(
-                "Agreed upon action items"
-            )[0]
-            sections["meeting_notes"] = parts.strip()
-
-        if "Agreed upon action items" in structured_output:
-            parts = structured_output.split("Agreed upon action items")[1]
-            sections["action_items"] = parts.strip()
+        # Render each section as the bullet list the summarization agent expects
+        sections = {}
+        for key in ("meeting_notes", "action_items"):
+            if key in parsed:
+                sections[key] = "\n".join(f"- {point}" for point in parsed[key])
 
         return sections
 
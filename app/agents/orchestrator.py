@@ -2,6 +2,7 @@ import json
 import os
 import sys
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
@@ -12,54 +13,88 @@ from app.agents.behavioural_bias_agent import BehaviouralBiasAgent
 from app.agents.data_quality_agent import DataQualityAgent
 from app.agents.financial_advisor_agent import FinancialAdvisorAgent
 from app.agents.product_portfolio_checker_agent import ProductPortfolioCheckerAgent
+from app.utils.data_loader import DataLoader
 from config.config import OUTPUT_DIR
 
 
+def _write_file(filepath, payload):
+    """Write a text payload to disk atomically, reporting the outcome."""
+    # Write to a temporary file first, so a crash never leaves a partial report
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+        print(f"\nResults saved to {filepath}")
+    except Exception as e:
+        print(f"Error saving results: {e}")
+
+
 class Orchestrator:
     """Coordinates all agents to process a client-advisor conversation."""
 
-    def __init__(self):
-        """Initialize the orchestrator with all required agents."""
+    def __init__(self, on_token=None):
+        """
+        Initialize the orchestrator with all required agents.
+
+        Args:
+            on_token (callable, optional): Receives the financial recommendations
+                token by token while they are generated.
+        """
         self.data_retrieval_agent = DataRetrievalAgent()
+        self.on_token = on_token
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
 
     def save_results(self, results):
         """
-        Save results to txt file.
+        Save results to a markdown file in the background.
 
         Args:
-            results (dict): Results from all agents.
+            results (str): Markdown summary from the summarization agent.
+
+        Returns:
+            Future: Completes once the file has been written.
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"meeting_analysis_{timestamp}.md"
         filepath = os.path.join(OUTPUT_DIR, filename)
 
-        try:
-            with open(filepath, "w") as f:
-                f.write(results)
-            print(f"\nResults saved to {filepath}")
-        except Exception as e:
-            print(f"Error saving results: {e}")
+        return self._io_pool.submit(_write_file, filepath, results)
 
     def run(self):
         """
         Run the full pipeline to process the conversation.
 
         Returns:
-            dict: Results from all agents.
+            str: The markdown summary. It is written to disk in the background.
         """
-        behavioural_bias_summary = BehaviouralBiasAgent().run()
-        data_quality_check = DataQualityAgent().run()
-        product_portfolio_check = ProductPortfolioCheckerAgent().run()
-        financial_advises = FinancialAdvisorAgent().run()
-        meeting_notes = MeetingNotesAgent().run()
+        # Load the transcript once up front so the agents don't all transcribe it
+        DataLoader.load_transcript()
+
+        # The analysis agents are independent, so their LLM calls run concurrently
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            behavioural_bias_summary = executor.submit(BehaviouralBiasAgent().run)
+            data_quality_check = executor.submit(DataQualityAgent().run)
+            product_portfolio_check = executor.submit(
+                ProductPortfolioCheckerAgent().run
+            )
+            financial_advises = executor.submit(
+                FinancialAdvisorAgent(
+                    data_retrieval_agent=self.data_retrieval_agent
+                ).run,
+                on_token=self.on_token,
+            )
+            meeting_notes = executor.submit(MeetingNotesAgent().run)
+
         summary = SummarizationAgent().run(
-            behavioural_bias_summary,
-            data_quality_check,
-            product_portfolio_check,
-            financial_advises,
-            meeting_notes,
+            behavioural_bias_summary.result(),
+            data_quality_check.result(),
+            product_portfolio_check.result(),
+            financial_advises.result(),
+            meeting_notes.result(),
         )
         self.save_results(summary)
+        return summary
 
 
 if __name__ == "__main__":
@@ -1,12 +1,33 @@
 import os
 import sys
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from app.agents.base_agent import BaseAgent
 from app.utils.data_loader import DataLoader
 from app.utils.vector_store import VectorStore
+from config.config import SMALL_LLM_MODEL
+
+INQUIRY_PROMPT_TEMPLATE = """Extract the client's inquiries about specific products or services. Exclude general financial advice requests.
+
+Return a JSON object (empty list if there are none):
+{{"product_inquiries": [{{"product_type": "...", "specific_need": "...", "context": "brief context"}}]}}
+
+Conversation:
+{transcript}"""
+
+RELEVANCE_PROMPT_TEMPLATE = """For each inquiry below, decide from its retrieved products whether Raiffeisen offers a match.
+
+Return a JSON object {{"results": [...]}} with one entry per inquiry, in order, each exactly one of:
+"EXISTS", "DOES_NOT_EXIST", "UNCLEAR" (insufficient information)
+
+{inquiries}"""
+
+INQUIRY_SYSTEM_PROMPT = "You are a product portfolio expert designed to output JSON. Extract only explicit product inquiries. Do not make assumptions or general financial advice requests."
+
+RELEVANCE_SYSTEM_PROMPT = "You are a product portfolio expert designed to output JSON. Analyze product inquiries against Raiffeisen's product portfolio and determine if a matching product exists."
 
 
 class ProductPortfolioCheckerAgent(BaseAgent):
@@ -22,36 +43,15 @@ class ProductPortfolioCheckerAgent(BaseAgent):
         Returns a dictionary of product inquiries.
         """
         transcript = DataLoader.load_transcript()
-        prompt_template = """
-        Extract ONLY product-related inquiries or requests from this conversation.
-        Focus on specific products or services the client is asking about.
-        DO NOT include general financial advice requests.
-        
-        Conversation:
-        {transcript}
-        
-        Return a JSON object with these fields (only include fields that are explicitly mentioned):
-        {{
-            "product_inquiries": [
-                {{
-                    "product_type": "type of product/service inquired about",
-                    "specific_need": "specific need or requirement mentioned",
-                    "context": "brief context of the inquiry"
-                }}
-            ]
-        }}
-        
-        If no product inquiries are mentioned, return an empty list for product_inquiries.
-        """
 
         messages = [
             {
                 "role": "system",
-                "content": "You are a product portfolio expert designed to output JSON. Extract only explicit product inquiries. Do not make assumptions or general financial advice requests.",
+                "content": INQUIRY_SYSTEM_PROMPT,
             },
             {
                 "role": "user",
-                "content": prompt_template.format(transcript=transcript),
+                "content": INQUIRY_PROMPT_TEMPLATE.format(transcript=transcript),
             },
         ]
 
@@ -65,65 +65,127 @@ class ProductPortfolioCheckerAgent(BaseAgent):
             print("Error: Could not parse product inquiries as JSON")
             return {"product_inquiries": []}
 
-    def check_against_portfolio(self, inquiries: dict) -> list:
+    def check_relevance(self, searches: list) -> list:
+        """
+        Decide in a single LLM call whether each inquiry matches a product.
+
+        Args:
+            searches (list): (search_query, search_results) tuples.
+
+        Returns:
+            list: One of "EXISTS", "DOES_NOT_EXIST" or "UNCLEAR" per search, in order.
+        """
+        if not searches:
+            return []
+
+        inquiries_text = "\n\n".join(
+            f"Inquiry {i+1}: {search_query}\nRetrieved Results:\n"
+            + "\n".join(
+                f"Result {j+1}: {result.page_content}"
+                for j, result in enumerate(search_results)
+            )
+            for i, (search_query, search_results) in enumerate(searches)
+        )
+
+        relevance_prompt = RELEVANCE_PROMPT_TEMPLATE.format(inquiries=inquiries_text)
+
+        relevance_messages = [
+            {
+                "role": "system",
+                "content": RELEVANCE_SYSTEM_PROMPT,
+            },
+            {"role": "user", "content": relevance_prompt},
+        ]
+
+        # A plain classification, so the smaller model is sufficient
+        response = self.get_completion(
+            relevance_messages,
+            temperature=0,
+            response_format={"type": "json_object"},
+            model=SMALL_LLM_MODEL,
+        )
+
+        try:
+            results = json.loads(response).get("results", [])
+        except (json.JSONDecodeError, AttributeError):
+            results = []
+
+        if len(results) != len(searches):
+            print("Error: Could not parse product relevance results as JSON")
+            return ["UNCLEAR"] * len(searches)
+
+        return [str(result).strip().upper() for result in results]
+
+    def load_product_vector_store(self) -> VectorStore:
+        """
+        Load (or build) the product portfolio vector store.
+        Returns the VectorStore wrapper holding the index.
+        """
+        product_data = DataLoader.load_product_portfolio()
+        vector_store = VectorStore()
+        vector_store.create_or_load(product_data, "product_portfolio", quantize=True)
+        return vector_store
+
+    def check_against_portfolio(self, inquiries: dict, vector_store=None) -> list:
         """
         Check product inquiries against the existing portfolio.
         Returns a list of findings about product availability.
+
+        The vector store may be passed as a Future; it is only waited on when
+        there are inquiries to check.
         """
         findings = []
 
-        product_data = DataLoader.load_product_portfolio()
-        vector_store = VectorStore()
-        product_vector_store = vector_store.create_or_load(
-            product_data, "product_portfolio"
-        )
+        product_inquiries = inquiries.get("product_inquiries", [])
+        if not product_inquiries:
+            print("No product inquiries found. Skipping portfolio check.")
+            return findings
+
+        if vector_store is None:
+            vector_store = self.load_product_vector_store()
+        elif isinstance(vector_store, Future):
+            vector_store = vector_store.result()
+        product_vector_store = vector_store.vector_store
+        if product_vector_store is None:
+            print("Product vector store not available. Skipping portfolio check.")
+            return findings
+
+        search_queries = [
+            f"{inquiry.get('product_type', '')} {inquiry.get('specific_need', '')}"
+            for inquiry in product_inquiries
+        ]
 
-        for inquiry in inquiries.get("product_inquiries", []):
-            product_type = inquiry.get("product_type", "")
-            specific_need = inquiry.get("specific_need", "")
-            search_query = f"{product_type} {specific_need}"
-            search_results = product_vector_store.similarity_search(search_query, k=3)
-
-            if search_results:
-                relevance_prompt = f"""
-                Analyze the following product inquiry and retrieved results to determine if Raiffeisen offers a product that matches the inquiry.
-                
-                Inquiry: {search_query}
-                
-                Retrieved Results:
-                {chr(10).join([f"Result {i+1}: {result.page_content}" for i, result in enumerate(search_results)])}
-                
-                Based on the above information, determine if Raiffeisen offers a product that matches the inquiry.
-                Return ONLY one of these exact responses:
-                - "EXISTS" if Raiffeisen offers a product that matches the inquiry
-                - "DOES_NOT_EXIST" if Raiffeisen does not offer a product that matches the inquiry
-                - "UNCLEAR" if the information is insufficient to determine
-                """
-
-                relevance_messages = [
-                    {
-                        "role": "system",
-                        "content": "You are a product portfolio expert. Analyze product inquiries against Raiffeisen's product portfolio and determine if a matching product exists.",
-                    },
-                    {"role": "user", "content": relevance_prompt},
-                ]
+        # Embed all search queries in one request instead of one per inquiry
+        query_vectors = vector_store.embeddings.embed_documents(search_queries)
+        all_search_results = [
+            product_vector_store.similarity_search_by_vector(query_vector, k=3)
+            for query_vector in query_vectors
+        ]
 
-                relevance_response = (
-                    self.get_completion(relevance_messages, temperature=0)
-                    .strip()
-                    .upper()
-                )
+        relevance = iter(
+            self.check_relevance(
+                [
+                    (search_query, search_results)
+                    for search_query, search_results in zip(
+                        search_queries, all_search_results
+                    )
+                    if search_results
+                ]
+            )
+        )
 
-                if relevance_response == "DOES_NOT_EXIST":
-                    finding = f"- During the meeting, Haris asked whether Raiffeisen has a solution for {product_type.lower()} which does not currently exist."
-                    findings.append(finding)
-                elif relevance_response == "UNCLEAR":
-                    finding = f"- During the meeting, Haris asked about {product_type.lower()}, but the information about this product in our portfolio is unclear."
-                    findings.append(finding)
+        for inquiry, search_results in zip(product_inquiries, all_search_results):
+            product_type = inquiry.get("product_type", "")
+            relevance_response = (
+                next(relevance) if search_results else "DOES_NOT_EXIST"
+            )
 
-            else:
+            if relevance_response == "DOES_NOT_EXIST":
                 finding = f"- During the meeting, Haris asked whether Raiffeisen has a solution for {product_type.lower()} which does not currently exist."
                 findings.append(finding)
+            elif relevance_response == "UNCLEAR":
+                finding = f"- During the meeting, Haris asked about {product_type.lower()}, but the information about this product in our portfolio is unclear."
+                findings.append(finding)
 
         return findings
 
@@ -132,8 +194,13 @@ class ProductPortfolioCheckerAgent(BaseAgent):
         Generate a report of product inquiries and portfolio gaps.
         Returns a list of findings in a consistent format.
         """
+        # Inquiry extraction and loading the product index are independent
+        executor = ThreadPoolExecutor(max_workers=1)
+        vector_store = executor.submit(self.load_product_vector_store)
+        executor.shutdown(wait=False)
         inquiries = self.extract_product_inquiries()
-        findings = self.check_against_portfolio(inquiries)
+
+        findings = self.check_against_portfolio(inquiries, vector_store)
         return findings
 
     def run(self):
@@ -5,9 +5,6 @@ import json
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from app.agents.base_agent import BaseAgent
-from app.utils.data_loader import DataLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from config.config import CHUNK_SIZE, CHUNK_OVERLAP
 
 
 class SummarizationAgent(BaseAgent):
@@ -1,5 +1,6 @@
 """
 Utility modules for the AI-Augmented Financial Advisor System.
 
-Includes utilities for data loading and vector storage.
+Includes utilities for data loading, vector storage, LLM response caching
+and the shared Azure OpenAI client.
 """
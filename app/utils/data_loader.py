@@ -1,8 +1,11 @@
+import io
 import os
+import functools
 import pandas as pd
 import docx2txt
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
@@ -11,43 +14,144 @@ from config.config import (
     PRODUCT_PORTFOLIO_PATH,
     TRANSCRIPT_PATH,
     BIASES_PATH,
+    MAX_CONCURRENT_REQUESTS,
+    TRANSCRIPTION_SHARD_SECONDS,
+    TRANSCRIPTION_TIMEOUT,
 )
-from openai import AzureOpenAI
-from dotenv import load_dotenv
+from app.utils.openai_client import get_client
+
+
+@functools.lru_cache(maxsize=8)
+def _read_text_file(path, mtime):
+    """Read a text file, memoized until its modification time changes."""
+    print(f"Loading cached transcript from {path}")
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
+CLIENT_STATE_COLUMNS = ("Category", "Field", "Value", "Notes")
+BIASES_COLUMNS = ("Category", "Bias", "Description", "Examples")
+
+
+@functools.lru_cache(maxsize=4)
+def _read_csv(path, mtime, columns):
+    """
+    Read columns of a CSV file, memoized until its modification time changes.
+
+    Errors propagate, so failed reads are never cached. The returned DataFrame
+    is shared between calls and must not be modified in place.
+    """
+    return pd.read_csv(path, usecols=list(columns))[list(columns)]
+
+
+@functools.lru_cache(maxsize=2)
+def _read_docx_text(path, mtime):
+    """Extract the text of a Word document, memoized until its modification time changes."""
+    return docx2txt.process(path)
+
+
+def _transcribe(file):
+    """Transcribe an audio file or (name, buffer) pair with Azure OpenAI Whisper."""
+    transcript = get_client().audio.transcriptions.create(
+        model="whisper", file=file, timeout=TRANSCRIPTION_TIMEOUT
+    )
+    return transcript.text
+
+
+def _transcribe_shard(index, shard):
+    """Transcribe one audio segment with Azure OpenAI Whisper."""
+    buffer = io.BytesIO()
+    shard.export(buffer, format="mp3")
+    buffer.seek(0)
+    return _transcribe((f"shard-{index}.mp3", buffer))
+
+
+def _transcribe_audio(audio_file):
+    """
+    Transcribe an audio file, splitting long recordings into shards.
+
+    Recordings up to TRANSCRIPTION_SHARD_SECONDS are uploaded unchanged. Longer
+    ones are cut at the pause closest before each shard boundary, so no word is
+    split, and the shards are transcribed concurrently.
+
+    Args:
+        audio_file (file): The audio file, opened in binary mode.
+
+    Returns:
+        str: The transcript text.
+    """
+    # pydub is only needed when no cached transcript exists
+    from pydub.utils import mediainfo
+
+    # Read the duration from the container without decoding the audio; if it
+    # can't be determined, the file is uploaded as is
+    try:
+        duration = float(mediainfo(audio_file.name)["duration"])
+    except (OSError, KeyError, ValueError):
+        duration = 0
+
+    if duration <= TRANSCRIPTION_SHARD_SECONDS:
+        return _transcribe(audio_file)
+
+    from pydub import AudioSegment
+    from pydub.silence import detect_silence
+
+    audio = AudioSegment.from_file(audio_file)
+    shard_ms = TRANSCRIPTION_SHARD_SECONDS * 1000
+
+    pauses = [
+        (start + end) // 2
+        for start, end in detect_silence(
+            audio, min_silence_len=500, silence_thresh=audio.dBFS - 16
+        )
+    ]
+    cuts = [0]
+    while len(audio) - cuts[-1] > shard_ms:
+        boundary = cuts[-1] + shard_ms
+        candidates = [pause for pause in pauses if cuts[-1] < pause <= boundary]
+        cuts.append(candidates[-1] if candidates else boundary)
+    cuts.append(len(audio))
+
+    shards = [audio[start:end] for start, end in zip(cuts, cuts[1:])]
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        texts = list(executor.map(_transcribe_shard, range(len(shards)), shards))
+    return " ".join(text.strip() for text in texts)
 
 
 class DataLoader:
     """Utility class to load and process data from different file formats."""
 
     @staticmethod
-    def load_client_state_txt() -> str:
+    def load_client_state_records() -> list:
+        """Load the client state as one dict per field, with its category and notes."""
         try:
-            if not os.path.exists(CLIENT_STATE_PATH):
-                print(f"Warning: Client state file not found at {CLIENT_STATE_PATH}")
-                return ""
-
-            df = pd.read_csv(CLIENT_STATE_PATH)
-            client_data_text = ""
-            for _, row in df.iterrows():
-                row_text = " ".join([f"{col}: {val}" for col, val in row.items()])
-                client_data_text += row_text + "\n"
-
-            return client_data_text
+            df = _read_csv(
+                CLIENT_STATE_PATH,
+                os.stat(CLIENT_STATE_PATH).st_mtime,
+                CLIENT_STATE_COLUMNS,
+            )
+            return df.fillna("").to_dict(orient="records")
+        except FileNotFoundError:
+            print(f"Warning: Client state file not found at {CLIENT_STATE_PATH}")
+            return []
         except Exception as e:
             print(f"Error loading client state: {e}")
-            return ""
+            return []
 
     @staticmethod
     def load_client_state_dict() -> dict:
         try:
-            if not os.path.exists(CLIENT_STATE_PATH):
-                print(f"Warning: Client state file not found at {CLIENT_STATE_PATH}")
-                return {}
-
-            df = pd.read_csv(CLIENT_STATE_PATH)
+            df = _read_csv(
+                CLIENT_STATE_PATH,
+                os.stat(CLIENT_STATE_PATH).st_mtime,
+                CLIENT_STATE_COLUMNS,
+            )
             fields = df["Field"].tolist()
             values = df["Value"].tolist()
             return dict(zip(fields, values))
+        except FileNotFoundError:
+            print(f"Warning: Client state file not found at {CLIENT_STATE_PATH}")
+            return {}
         except Exception as e:
             print(f"Error loading client state: {e}")
             return {}
@@ -56,14 +160,14 @@ class DataLoader:
     def load_product_portfolio():
         """Extract text from product portfolio document."""
         try:
-            if not os.path.exists(PRODUCT_PORTFOLIO_PATH):
-                print(
-                    f"Warning: Product portfolio file not found at {PRODUCT_PORTFOLIO_PATH}"
-                )
-                return ""
-
-            text = docx2txt.process(PRODUCT_PORTFOLIO_PATH)
-            return text
+            return _read_docx_text(
+                PRODUCT_PORTFOLIO_PATH, os.stat(PRODUCT_PORTFOLIO_PATH).st_mtime
+            )
+        except FileNotFoundError:
+            print(
+                f"Warning: Product portfolio file not found at {PRODUCT_PORTFOLIO_PATH}"
+            )
+            return ""
         except Exception as e:
             print(f"Error loading product portfolio: {e}")
             return ""
@@ -79,40 +183,29 @@ class DataLoader:
             os.path.dirname(TRANSCRIPT_PATH), "transcript.txt"
         )
 
-        # Check if cached transcript exists
-        if os.path.exists(transcript_cache_path):
-            print(f"Loading cached transcript from {transcript_cache_path}")
-            with open(transcript_cache_path, "r") as f:
-                return f.read()
+        # Use the cached transcript if it exists; it is re-read only when it changes.
+        # A single stat both checks for the file and provides the cache key.
+        try:
+            return _read_text_file(
+                transcript_cache_path, os.stat(transcript_cache_path).st_mtime
+            )
+        except FileNotFoundError:
+            pass
 
-        # If no cached transcript, check if audio file exists
-        if not os.path.exists(TRANSCRIPT_PATH):
+        # If no cached transcript, transcribe the audio file
+        try:
+            audio_file = open(TRANSCRIPT_PATH, "rb")
+        except FileNotFoundError:
             raise FileNotFoundError(f"Transcript file not found at {TRANSCRIPT_PATH}")
 
-        # Load environment variables
-        load_dotenv()
-
-        # Initialize Azure OpenAI client
-        client = AzureOpenAI(
-            api_version="2024-02-15-preview",
-            azure_endpoint="https://swisshacks-aoai-westeurope.openai.azure.com/",
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-        )
-
-        # Transcribe the audio file
         print(f"Transcribing audio file {TRANSCRIPT_PATH}...")
-        with open(TRANSCRIPT_PATH, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper", file=audio_file
-            )
-
-        # Extract the text content
-        transcript_text = transcript.text
+        with audio_file:
+            transcript_text = _transcribe_audio(audio_file)
 
         # Save the transcript to cache
         print(f"Saving transcript to {transcript_cache_path}")
-        with open(transcript_cache_path, "w") as f:
-            f.write(transcript_text)
+        with open(transcript_cache_path, "wb") as f:
+            f.write(transcript_text.encode("utf-8"))
 
         return transcript_text
 
@@ -120,28 +213,33 @@ class DataLoader:
     def load_biases():
         """Load behavioral biases from the CSV file."""
         try:
-            if not os.path.exists(BIASES_PATH):
-                print(f"Warning: Biases file not found at {BIASES_PATH}")
-                return []
-
-            df = pd.read_csv(BIASES_PATH)
+            df = _read_csv(BIASES_PATH, os.stat(BIASES_PATH).st_mtime, BIASES_COLUMNS)
 
             # Convert DataFrame to a list of dictionaries
-            biases = []
-            for _, row in df.iterrows():
-                bias = {
-                    "category": row["Category"],
-                    "bias": row["Bias"],
-                    "description": row["Description"],
-                    "examples": row["Examples"],
-                }
-                biases.append(bias)
-
-            return biases
+            columns = {
+                "Category": "category",
+                "Bias": "bias",
+                "Description": "description",
+                "Examples": "examples",
+            }
+            return df.rename(columns=columns).to_dict(orient="records")
+        except FileNotFoundError:
+            print(f"Warning: Biases file not found at {BIASES_PATH}")
+            return []
         except Exception as e:
             print(f"Error loading biases: {e}")
             return []
 
+    @staticmethod
+    def load_biases_text() -> str:
+        """Load the behavioral bias definitions serialized for use in a prompt."""
+        return "".join(
+            f"Category: {bias['category']}\n"
+            f"Bias: {bias['bias']}\n"
+            f"Description: {bias['description']}\n"
+            f"Example: {bias['examples']}\n\n"
+            for bias in DataLoader.load_biases()
+        )
 
 if __name__ == "__main__":
 
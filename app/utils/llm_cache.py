@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+import faiss
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from config.config import (
+    OPENAI_API_KEY,
+    EMBEDDING_MODEL,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+)
+
+
+def _connect(path):
+    """Open a SQLite connection that can be shared between threads."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return sqlite3.connect(path, check_same_thread=False)
+
+
+class LLMCache:
+    """Utility class to cache LLM responses on disk, keyed on the full request."""
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL):
+        """
+        Open (or create) the SQLite cache database.
+
+        Args:
+            path (str): Location of the SQLite database file.
+            ttl (int): Seconds after which entries are ignored; 0 keeps them forever.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        # Databases written before entries expired lack the timestamp column; their
+        # rows are migrated with a creation time of 0, so a TTL treats them as stale
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(llm_cache)")]
+        if "created_at" not in columns:
+            self._conn.execute(
+                "ALTER TABLE llm_cache ADD COLUMN created_at REAL NOT NULL DEFAULT 0"
+            )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(**request):
+        """Build a stable cache key from the request parameters."""
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached response for a key, or None on a miss."""
+        min_created_at = time.time() - self.ttl if self.ttl else 0
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND created_at >= ?",
+                (key, min_created_at),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, response):
+        """Store a response under the given key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) "
+                "VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+            self._conn.commit()
+
+
+class SemanticCache:
+    """Utility class to reuse LLM responses for near-duplicate prompts."""
+
+    def __init__(
+        self,
+        path=LLM_CACHE_PATH,
+        threshold=SEMANTIC_CACHE_THRESHOLD,
+        ttl=SEMANTIC_CACHE_TTL,
+    ):
+        """
+        Open (or create) the semantic cache table.
+
+        Args:
+            path (str): Location of the SQLite database file.
+            threshold (float): Minimum cosine similarity for a cache hit.
+            ttl (int): Seconds after which cached entries are ignored.
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.embeddings = OpenAIEmbeddings(
+            model=EMBEDDING_MODEL, openai_api_key=OPENAI_API_KEY
+        )
+        self._lock = threading.Lock()
+        # Per-namespace in-memory index: (faiss index, responses, created_at times)
+        self._namespaces = {}
+        self._conn = _connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache "
+            "(namespace TEXT NOT NULL, embedding BLOB NOT NULL, "
+            "response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def embed(self, text):
+        """Embed a prompt into a unit-length vector."""
+        vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def get(self, namespace, vector):
+        """
+        Return the most similar cached response, if it is similar enough.
+
+        Args:
+            namespace (str): Cache partition, e.g. the agent class name.
+            vector (np.ndarray): Unit-length prompt embedding from `embed`.
+
+        Returns:
+            str or None: The cached response, or None on a miss.
+        """
+        with self._lock:
+            index, responses, created_at = self._load_namespace(namespace, len(vector))
+            if index.ntotal == 0:
+                return None
+            similarities, ids = index.search(vector.reshape(1, -1), 1)
+
+        best = int(ids[0][0])
+        if (
+            similarities[0][0] >= self.threshold
+            and created_at[best] >= time.time() - self.ttl
+        ):
+            return responses[best]
+        return None
+
+    def set(self, namespace, vector, response):
+        """Store a response together with its prompt embedding."""
+        now = time.time()
+        with self._lock:
+            index, responses, created_at = self._load_namespace(namespace, len(vector))
+            index.add(vector.reshape(1, -1))
+            responses.append(response)
+            created_at.append(now)
+
+            self._conn.execute(
+                "INSERT INTO semantic_cache (namespace, embedding, response, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (namespace, vector.astype(np.float32).tobytes(), response, now),
+            )
+            self._conn.commit()
+
+    def _load_namespace(self, namespace, dimension):
+        """Build the in-memory index for a namespace on first use; caller holds the lock."""
+        if namespace not in self._namespaces:
+            rows = self._conn.execute(
+                "SELECT embedding, response, created_at FROM semantic_cache "
+                "WHERE namespace = ? AND created_at >= ?",
+                (namespace, time.time() - self.ttl),
+            ).fetchall()
+
+            # Inner product on unit vectors is cosine similarity
+            index = faiss.IndexFlatIP(dimension)
+            if rows:
+                index.add(
+                    np.stack([np.frombuffer(row[0], dtype=np.float32) for row in rows])
+                )
+            self._namespaces[namespace] = (
+                index,
+                [row[1] for row in rows],
+                [row[2] for row in rows],
+            )
+
+        return self._namespaces[namespace]
@@ -0,0 +1,40 @@
+import os
+import atexit
+import functools
+import httpx
+from openai import AzureOpenAI
+from dotenv import load_dotenv
+
+from config.config import LLM_API_VERSION, LLM_MAX_RETRIES
+
+# One keep-alive HTTP/2 connection pool for all API calls, so TLS handshakes are reused
+_http_client = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    timeout=httpx.Timeout(60.0, connect=5.0),
+)
+atexit.register(_http_client.close)
+
+
+@functools.lru_cache(maxsize=2)
+def get_client(api_version=LLM_API_VERSION):
+    """
+    Return the Azure OpenAI client shared by the agents and utilities.
+
+    Args:
+        api_version (str): Azure OpenAI API version; batch jobs need a newer one.
+
+    Returns:
+        AzureOpenAI: The shared client for that API version, created on first use.
+    """
+    # Load environment variables
+    load_dotenv()
+
+    # Initialize Azure OpenAI client
+    return AzureOpenAI(
+        api_version=api_version,
+        azure_endpoint="https://swisshacks-aoai-westeurope.openai.azure.com/",
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        http_client=_http_client,
+        max_retries=LLM_MAX_RETRIES,
+    )
@@ -1,4 +1,3 @@
-import os
 import sys
 import openai
 import json
@@ -8,21 +7,11 @@ from docx import Document
 from docx.shared import Pt
 
 from config.config import OUTPUT_DIR
+from app.utils.openai_client import get_client
 
 
 def translate_text(text):
-    from openai import AzureOpenAI
-    from dotenv import load_dotenv
-
-    load_dotenv()
-
-    client = AzureOpenAI(
-        api_version="2024-02-15-preview",
-        azure_endpoint="https://swisshacks-aoai-westeurope.openai.azure.com/",
-        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-    )
-
-    response = client.chat.completions.create(
+    response = get_client().chat.completions.create(
         model="gpt-4o",
         messages=[
             {"role": "system", "content": "Translate from German to English."},
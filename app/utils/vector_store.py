@@ -1,5 +1,10 @@
 import os
+import hashlib
+import threading
+import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_openai import OpenAIEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from config.config import (
@@ -8,31 +13,60 @@ from config.config import (
     CHUNK_OVERLAP,
     VECTOR_STORE_PATH,
     EMBEDDING_MODEL,
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
 )
 
 
 class VectorStore:
     """Utility class to manage the vector store for semantic search."""
 
+    # The splitter is stateless, so all instances share one
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+    )
+
+    # Serializes building/loading of each collection across threads
+    _collection_locks = {}
+    _collection_locks_guard = threading.Lock()
+
     def __init__(self):
         """Initialize the vector store with OpenAI embeddings."""
         self.embeddings = OpenAIEmbeddings(
             model=EMBEDDING_MODEL, openai_api_key=OPENAI_API_KEY
         )
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
-        )
         self.vector_store = None
 
-    def create_or_load(self, texts, collection_name):
-        """Create a new vector store or load an existing one."""
+    def create_or_load(self, texts, collection_name, quantize=False):
+        """
+        Create a new vector store or load an existing one.
+
+        Args:
+            texts: Text, list of texts or list of documents to index.
+            collection_name (str): Name of the collection on disk.
+            quantize (bool): Store vectors as 8-bit scalars instead of float32.
+        """
+        with VectorStore._collection_locks_guard:
+            lock = VectorStore._collection_locks.setdefault(
+                collection_name, threading.Lock()
+            )
+
+        # Agents running concurrently must not build the same collection twice
+        with lock:
+            return self._create_or_load(texts, collection_name, quantize)
+
+    def _create_or_load(self, texts, collection_name, quantize):
+        """Create or load a collection; the caller holds the collection lock."""
         os.makedirs(VECTOR_STORE_PATH, exist_ok=True)
 
         # Collection path for this specific data
         collection_path = os.path.join(VECTOR_STORE_PATH, collection_name)
+        hash_path = os.path.join(collection_path, "content.hash")
+        content_hash = self._content_hash(texts, quantize)
 
-        # Check if vector store already exists
-        if os.path.exists(collection_path) and os.path.isdir(collection_path):
+        # Reuse the stored index only if it was built from the same content
+        if self._read_hash(hash_path) == content_hash:
             try:
                 print(f"Loading existing vector store from {collection_path}")
                 self.vector_store = FAISS.load_local(
@@ -44,6 +78,8 @@ class VectorStore:
             except Exception as e:
                 print(f"Error loading vector store: {e}")
                 print("Creating a new vector store...")
+        elif os.path.isdir(collection_path):
+            print(f"Vector store at {collection_path} is out of date. Rebuilding...")
 
         # Create new vector store if it doesn't exist or loading failed
         docs = self._prepare_documents(texts)
@@ -53,17 +89,71 @@ class VectorStore:
             return None
 
         print(f"Creating new vector store with {len(docs)} documents")
-        self.vector_store = FAISS.from_documents(docs, self.embeddings)
+        self.vector_store = self._build_index(docs, quantize)
 
         # Save the vector store locally
         try:
             self.vector_store.save_local(collection_path)
+            with open(hash_path, "w") as f:
+                f.write(content_hash)
             print(f"Vector store saved to {collection_path}")
         except Exception as e:
             print(f"Error saving vector store: {e}")
 
         return self.vector_store
 
+    @staticmethod
+    def _content_hash(texts, quantize=False):
+        """Hash the content and index settings a vector store is built from."""
+        digest = hashlib.blake2b(digest_size=16)
+        settings = f"{EMBEDDING_MODEL}|{CHUNK_SIZE}|{CHUNK_OVERLAP}|{HNSW_M}|{HNSW_EF_CONSTRUCTION}|{HNSW_EF_SEARCH}|{quantize}"
+        digest.update(settings.encode("utf-8"))
+
+        items = [texts] if isinstance(texts, str) else texts
+        for item in items:
+            content = item.page_content if hasattr(item, "page_content") else str(item)
+            digest.update(b"\0" + content.encode("utf-8"))
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def _read_hash(hash_path):
+        """Read the stored content hash, or return None if there is none."""
+        try:
+            with open(hash_path, "r") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def _build_index(self, docs, quantize=False):
+        """Embed the documents into an HNSW-backed FAISS store."""
+        texts = [doc.page_content for doc in docs]
+        vectors = self.embeddings.embed_documents(texts)
+        dimension = len(vectors[0])
+
+        # HNSW keeps query cost roughly logarithmic in the number of documents
+        if quantize:
+            # 8-bit scalar quantization cuts memory traffic per distance by 4x
+            index = faiss.IndexHNSWSQ(
+                dimension, faiss.ScalarQuantizer.QT_8bit, HNSW_M
+            )
+            index.train(np.asarray(vectors, dtype=np.float32))
+        else:
+            index = faiss.IndexHNSWFlat(dimension, HNSW_M)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+
+        vector_store = FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={},
+        )
+        vector_store.add_embeddings(
+            zip(texts, vectors), metadatas=[doc.metadata for doc in docs]
+        )
+        return vector_store
+
     def _prepare_documents(self, texts):
         """Split the text into documents for indexing."""
         if isinstance(texts, str):
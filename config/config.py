@@ -14,13 +14,57 @@ TRANSCRIPT_PATH = os.path.abspath("data/transcript.m4a")
 BIASES_PATH = os.path.abspath("data/biases.csv")
 OUTPUT_DIR = os.path.abspath("output")
 
+# LLM response cache (opt-in, e.g. for development re-runs)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_PATH = os.path.abspath("data/llm_cache.sqlite")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "0"))  # Seconds, 0 = never expire
+
+# Semantic cache: reuse responses for near-duplicate prompts (opt-in)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = 0.97  # Minimum cosine similarity for a hit
+SEMANTIC_CACHE_TTL = 24 * 60 * 60  # Seconds
+
 # Vector store path
 VECTOR_STORE_PATH = os.path.abspath("data/vector_store")
 
+# HNSW index parameters for the FAISS vector stores
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
 # Model configuration
 LLM_MODEL = "gpt-4o"  # Azure OpenAI deployment name
+LLM_API_VERSION = "2024-02-15-preview"
+SMALL_LLM_MODEL = "gpt-4o-mini"  # Deployment for simple classification sub-tasks
+LLM_MAX_RETRIES = 3  # Retries with exponential backoff on 429s, timeouts and 5xx
+MAX_CONCURRENT_REQUESTS = 10  # Upper bound on parallel LLM requests per fan-out
 EMBEDDING_MODEL = "text-embedding-ada-002"
 
 # Agent configuration
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
+
+# Retrieval results shorter than this are returned verbatim, without an LLM summary
+MIN_SUMMARY_CHARS = 500
+
+# Client fields retrieved for the whole-profile query behind the recommendations
+CLIENT_PROFILE_RESULTS = 20
+
+# Transcripts longer than this are condensed chunk by chunk before analysis
+MAX_TRANSCRIPT_TOKENS = 6000
+TOKENIZER_ENCODING = "o200k_base"  # Tokenizer used by gpt-4o
+TRANSCRIPT_CHUNK_SIZE = 2000  # Tokens
+TRANSCRIPT_CHUNK_OVERLAP = 50  # Tokens
+CHUNK_DEDUP_THRESHOLD = 0.85  # Chunks this similar (Jaccard) to an earlier one are skipped
+
+# Summarize transcript chunks through the Azure OpenAI Batch API (for offline runs)
+TRANSCRIPT_BATCH_ENABLED = os.getenv("TRANSCRIPT_BATCH_ENABLED", "false").lower() == "true"
+BATCH_API_VERSION = "2024-10-21"  # First GA Azure API version with batch endpoints
+BATCH_LLM_MODEL = os.getenv("BATCH_LLM_MODEL", "gpt-4o-batch")  # Global-Batch deployment
+BATCH_POLL_INTERVAL = 30  # Seconds between batch job status checks
+BATCH_MAX_WAIT = int(os.getenv("BATCH_MAX_WAIT", "3600"))  # Seconds before falling back
+
+# Recordings longer than this are cut at pauses and transcribed in parallel shards
+TRANSCRIPTION_SHARD_SECONDS = 300
+# Long recordings can exceed the default request timeout
+TRANSCRIPTION_TIMEOUT = 600  # Seconds
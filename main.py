@@ -27,6 +27,28 @@ def check_requirements():
     return True
 
 
+class LinePrinter:
+    """Print streamed text one complete, prefixed line at a time."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.buffer = ""
+
+    def __call__(self, token):
+        # Only whole lines are printed, so they don't interleave with other agents' output
+        self.buffer += token
+        *lines, self.buffer = self.buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                print(f"{self.prefix}{line}\n", end="", flush=True)
+
+    def flush(self):
+        """Print any remaining partial line."""
+        if self.buffer.strip():
+            print(f"{self.prefix}{self.buffer}\n", end="", flush=True)
+        self.buffer = ""
+
+
 def main():
     """Run the financial advisor analysis system."""
     print("Financial Advisor Post-Meeting Analysis System")
@@ -35,8 +57,10 @@ def main():
     if not check_requirements():
         sys.exit(1)
 
-    orchestrator = Orchestrator()
+    recommendation_printer = LinePrinter("[Recommendations] ")
+    orchestrator = Orchestrator(on_token=recommendation_printer)
     orchestrator.run()
+    recommendation_printer.flush()
 
 
 if __name__ == "__main__":